@@ -0,0 +1,130 @@
+import argparse
+import gzip
+import json
+import sys
+
+import task_export
+import todo_db
+from config import Config
+from log_config import setup_logging
+
+
+def _selected_shards(shard: int | None) -> list[int]:
+    if shard is not None:
+        return [shard]
+    return list(range(todo_db.get_shard_count()))
+
+
+def cmd_reshard(args):
+    todo_db.reshard(args.shards)
+    print(f"Store now has {todo_db.get_shard_count()} shard(s).")
+
+
+def cmd_compact(args):
+    for shard in _selected_shards(args.shard):
+        todo_db.compact_shard(shard)
+        print(f"Compacted shard {shard}.")
+
+
+def cmd_backup(args):
+    for shard in _selected_shards(args.shard):
+        for path in todo_db.backup_shard(shard, args.backup_dir):
+            print(f"Backed up shard {shard} to {path}")
+
+
+def cmd_export(args):
+    raw_output = sys.stdout.buffer if args.output == "-" else open(args.output, "wb")
+    compress = args.gzip or args.output.endswith(".gz")
+    output = gzip.GzipFile(fileobj=raw_output, mode="wb") if compress else raw_output
+    try:
+        for line in task_export.iter_export_lines(per=args.per):
+            output.write(line.encode("utf-8"))
+    finally:
+        if compress:
+            output.close()
+        if raw_output is not sys.stdout.buffer:
+            raw_output.close()
+
+
+def cmd_import(args):
+    opener = gzip.open if args.input.endswith(".gz") else open
+    with opener(args.input, "rt", encoding="utf-8") as input_file:
+        imported = task_export.import_lines(input_file, batch_size=args.batch_size)
+    print(f"Imported {imported} records.")
+
+
+def cmd_stats(args):
+    print(json.dumps(todo_db.get_global_stats(), indent=4))
+
+
+def cmd_verify_stats(args):
+    drifted = todo_db.verify_stats()
+    print(f"Rebuilt counters for {drifted} drifted shard(s).")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Administrative tools for the to-do store."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    reshard_parser = subparsers.add_parser(
+        "reshard", help="Redistribute data across a new number of shards (online)."
+    )
+    reshard_parser.add_argument("shards", type=int, help="New shard count.")
+    reshard_parser.set_defaults(func=cmd_reshard)
+
+    compact_parser = subparsers.add_parser("compact", help="Compact shard files.")
+    compact_parser.add_argument(
+        "--shard", type=int, help="Only this shard (default: all)."
+    )
+    compact_parser.set_defaults(func=cmd_compact)
+
+    backup_parser = subparsers.add_parser("backup", help="Snapshot shard files.")
+    backup_parser.add_argument("backup_dir", help="Directory to write backups to.")
+    backup_parser.add_argument(
+        "--shard", type=int, help="Only this shard (default: all)."
+    )
+    backup_parser.set_defaults(func=cmd_backup)
+
+    export_parser = subparsers.add_parser("export", help="Stream all tasks as NDJSON.")
+    export_parser.add_argument("output", help="Output file, or - for stdout.")
+    export_parser.add_argument(
+        "--per",
+        choices=[task_export.RECORDS_PER_TASK, task_export.RECORDS_PER_CONVERSATION],
+        default=task_export.RECORDS_PER_TASK,
+        help="One record per task (default) or per conversation.",
+    )
+    export_parser.add_argument(
+        "--gzip", action="store_true", help="Gzip the output (implied by a .gz name)."
+    )
+    export_parser.set_defaults(func=cmd_export)
+
+    import_parser = subparsers.add_parser("import", help="Bulk-load an NDJSON export.")
+    import_parser.add_argument("input", help="NDJSON file, optionally .gz.")
+    import_parser.add_argument(
+        "--batch-size", type=int, default=task_export.IMPORT_BATCH_SIZE
+    )
+    import_parser.set_defaults(func=cmd_import)
+
+    stats_parser = subparsers.add_parser("stats", help="Show store-wide task counts.")
+    stats_parser.set_defaults(func=cmd_stats)
+
+    verify_parser = subparsers.add_parser(
+        "verify-stats", help="Rebuild task counters from the tasks themselves."
+    )
+    verify_parser.set_defaults(func=cmd_verify_stats)
+
+    return parser
+
+
+if __name__ == "__main__":
+    setup_logging()
+    # Admin tools work on whatever layout the manifest records
+    Config.TODO_DB_SHARDS = None
+    parser = build_parser()
+    parsed_args = parser.parse_args()
+    try:
+        parsed_args.func(parsed_args)
+    except ValueError as e:
+        parser.error(str(e))
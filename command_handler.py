@@ -6,7 +6,9 @@ from divar_client import DivarClient
 from commands.add_command import AddCommand
 from commands.delete_command import DeleteCommand
 from commands.done_command import DoneCommand
+from commands.export_command import ExportCommand
 from commands.help_command import HelpCommand
+from commands.stats_command import StatsCommand
 from commands.view_command import ViewCommand
 from commands.base_command import AbstractCommand
 
@@ -24,24 +26,34 @@ class CommandHandler:
         add_cmd = AddCommand(divar_client)
         delete_cmd = DeleteCommand(divar_client)
         done_cmd = DoneCommand(divar_client)
+        export_cmd = ExportCommand(divar_client)
         help_cmd = HelpCommand(divar_client)
+        stats_cmd = StatsCommand(divar_client)
         view_cmd = ViewCommand(divar_client)
         self.default_cmd = HelpCommand(divar_client)  # Default
 
-        all_commands = [add_cmd, delete_cmd, done_cmd, help_cmd, view_cmd]
+        all_commands = [
+            add_cmd,
+            delete_cmd,
+            done_cmd,
+            export_cmd,
+            help_cmd,
+            stats_cmd,
+            view_cmd,
+        ]
 
         for cmd in all_commands:
             cmd_name = cmd.get_command_name()
             if cmd_name:
                 if cmd_name in self.commands_by_name:
-                    logger.warning(f"Duplicate command name registration: {cmd_name}")
+                    logger.warning("Duplicate command name registration: %s", cmd_name)
                 self.commands_by_name[cmd_name] = cmd
 
             handled_state = cmd.get_handled_state()
             if handled_state:
                 if handled_state in self.commands_by_state:
                     logger.warning(
-                        f"Duplicate state handler registration: {handled_state}"
+                        "Duplicate state handler registration: %s", handled_state
                     )
                 self.commands_by_state[handled_state] = cmd
 
@@ -87,8 +99,16 @@ class CommandHandler:
                 self.divar_client.send_message_to_conversation(
                     conversation_id, response_text
                 )
-                logger.info(f"Sent response to {conversation_id}: {response_text}")
+                logger.debug(
+                    "Sent response to %s: %s",
+                    conversation_id,
+                    response_text,
+                    extra={"conversation_id": conversation_id},
+                )
             except Exception as e:
                 logger.error(
-                    f"Failed to send message to Divar for conversation {conversation_id}: {e}"
+                    "Failed to send message to Divar for conversation %s: %s",
+                    conversation_id,
+                    e,
+                    extra={"conversation_id": conversation_id},
                 )
@@ -0,0 +1,26 @@
+from .base_command import AbstractCommand
+import task_export
+
+
+class ExportCommand(AbstractCommand):
+    COMMAND_NAME = "/export"
+
+    def execute(
+        self,
+        conversation_id: str,
+        text: str,
+        original_text: str,
+        current_state: dict | None,
+    ) -> str:
+        export_text = "".join(
+            task_export.iter_export_lines(conversation_id=conversation_id)
+        )
+        if not export_text:
+            return "No tasks to export."
+        return export_text.rstrip("\n")
+
+    def get_command_name(self) -> str | None:
+        return self.COMMAND_NAME
+
+    def get_handled_state(self) -> str | None:
+        return None
@@ -19,6 +19,8 @@ class HelpCommand(AbstractCommand):
             "/view - View all tasks\n"
             "/delete - Delete a task by number\n"
             "/done - Mark a task as done by number\n"
+            "/export - Export your tasks as NDJSON\n"
+            "/stats - Show pending and done counts\n"
             "/help - Show this help message"
         )
 
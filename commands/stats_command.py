@@ -0,0 +1,28 @@
+from .base_command import AbstractCommand
+import todo_db
+
+
+class StatsCommand(AbstractCommand):
+    COMMAND_NAME = "/stats"
+
+    def execute(
+        self,
+        conversation_id: str,
+        text: str,
+        original_text: str,
+        current_state: dict | None,
+    ) -> str:
+        stats = todo_db.get_conversation_stats(conversation_id)
+        if not stats["total"]:
+            return "You have no tasks. Add one with /add <task description>."
+        return (
+            f"Pending: {stats['pending']}\n"
+            f"Done: {stats['done']}\n"
+            f"Completion rate: {stats['completion_rate']:.0%}"
+        )
+
+    def get_command_name(self) -> str | None:
+        return self.COMMAND_NAME
+
+    def get_handled_state(self) -> str | None:
+        return None
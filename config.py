@@ -11,3 +11,32 @@ class Config:
     DIVAR_APP_SLUG = os.getenv("DIVAR_APP_SLUG")
     DIVAR_OAUTH_SECRET = os.getenv("DIVAR_OAUTH_SECRET", "")
     DIVAR_REDIRECT_URI = f"{BASE_URL}/divar/oauth/callback"
+    DIVAR_API_BASE_URL = os.getenv("DIVAR_API_BASE_URL", "https://api.divar.ir")
+    DIVAR_OPEN_API_BASE_URL = os.getenv(
+        "DIVAR_OPEN_API_BASE_URL", "https://open-api.divar.ir"
+    )
+
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+    LOG_FILE = os.getenv("LOG_FILE")  # Defaults to stderr when unset
+    # Comma-separated "event=value" pairs, e.g. "webhook_received=0.1"
+    LOG_SAMPLE_RATES = os.getenv("LOG_SAMPLE_RATES", "")
+    LOG_RATE_LIMITS = os.getenv("LOG_RATE_LIMITS", "")
+
+    TODO_DB_DIR = os.getenv("TODO_DB_DIR", ".")
+    # Shard count for a new store; must match the store's manifest once it exists
+    TODO_DB_SHARDS = (
+        int(os.environ["TODO_DB_SHARDS"]) if os.getenv("TODO_DB_SHARDS") else None
+    )
+
+    # Token for the /admin endpoints (sent as X-Admin-Token); admin endpoints are disabled when unset
+    ADMIN_API_TOKEN = os.getenv("ADMIN_API_TOKEN", "")
+
+    # Seconds between rebuilds of the task counters from the tasks themselves; 0 disables it
+    STATS_VERIFY_INTERVAL = int(os.getenv("STATS_VERIFY_INTERVAL", "3600"))
+
+    # Opt-in webhook capture for replay_webhooks.py; disabled when unset
+    WEBHOOK_CAPTURE_FILE = os.getenv("WEBHOOK_CAPTURE_FILE", "")
+    WEBHOOK_CAPTURE_MAX_BYTES = int(
+        os.getenv("WEBHOOK_CAPTURE_MAX_BYTES", str(50 * 1024 * 1024))
+    )
+    WEBHOOK_CAPTURE_BACKUPS = int(os.getenv("WEBHOOK_CAPTURE_BACKUPS", "5"))
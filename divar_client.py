@@ -1,9 +1,9 @@
 import requests
 from config import Config
 import logging
+import time
 from datetime import datetime, timedelta
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
@@ -13,8 +13,8 @@ class DivarClient:
         self.client_secret = Config.DIVAR_OAUTH_SECRET
         self.redirect_uri = Config.DIVAR_REDIRECT_URI
         self.api_key = Config.DIVAR_API_KEY
-        self.base_url = "https://api.divar.ir"
-        self.open_api_base_url = "https://open-api.divar.ir"
+        self.base_url = Config.DIVAR_API_BASE_URL
+        self.open_api_base_url = Config.DIVAR_OPEN_API_BASE_URL
         self.scopes = [
             "USER_POSTS_ADDON_CREATE",
             "USER_ADDON_CREATE",
@@ -75,7 +75,6 @@ class DivarClient:
         response.raise_for_status()
 
         token_data = response.json()
-        print(token_data)  ## FIXME
         self.access_token = token_data.get("access_token")
         self.refresh_token = token_data.get("refresh_token")
         expires_in = token_data.get("expires_in")
@@ -142,16 +141,20 @@ class DivarClient:
         headers = self._get_authenticated_headers_v1()
 
         logger.info(
-            f"Subscribing to event: {event_type}, resource: {event_resource_id or 'all'} at {url}"
+            "Subscribing to event: %s, resource: %s at %s",
+            event_type,
+            event_resource_id or "all",
+            url,
         )
 
         response = requests.post(url, json=payload, headers=headers)
-        print(response.content)
+        logger.debug("Subscription response: %s", response.content)
         response.raise_for_status()
 
         if response.status_code == 204 or not response.content:
             logger.info(
-                f"Subscription to {event_type} successful with no content in response."
+                "Subscription to %s successful with no content in response.",
+                event_type,
             )
             return None
 
@@ -163,15 +166,22 @@ class DivarClient:
 
         headers = self._get_authenticated_headers_v2()
 
-        logger.info(f"Getting conversation by ID: {conversation_id} from {url}")
+        logger.info(
+            "Getting conversation by ID: %s from %s",
+            conversation_id,
+            url,
+            extra={"conversation_id": conversation_id},
+        )
 
         response = requests.get(url, headers=headers)
-        print(response.content)
+        logger.debug("Get conversation response: %s", response.content)
         response.raise_for_status()
 
         if response.status_code == 204 or not response.content:
             logger.info(
-                f"Successfully fetched conversation {conversation_id} with no content."
+                "Successfully fetched conversation %s with no content.",
+                conversation_id,
+                extra={"conversation_id": conversation_id},
             )
             return None
 
@@ -201,19 +211,29 @@ class DivarClient:
         if buttons:
             payload["buttons"] = buttons
 
-        logger.info(
-            f"Sending bot message to conversation {conversation_id} at {url} with payload: {payload}"
+        log_extra = {"event": "divar_send_message", "conversation_id": conversation_id}
+        logger.debug(
+            "Sending bot message to conversation %s at %s with payload: %s",
+            conversation_id,
+            url,
+            payload,
+            extra=log_extra,
         )
 
+        started = time.perf_counter()
         response = requests.post(url, json=payload, headers=headers)
-        print(response.content)
+        log_extra["duration_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        log_extra["status"] = response.status_code
+        logger.debug("Send message response: %s", response.content, extra=log_extra)
         response.raise_for_status()
 
         if response.status_code == 200 and response.content:
             return response.json()
         elif response.status_code == 200:
             logger.info(
-                f"Message sent to {conversation_id} successfully with no JSON response body."
+                "Message sent to %s successfully with no JSON response body.",
+                conversation_id,
+                extra=log_extra,
             )
             return {
                 "status": "success",
@@ -221,6 +241,9 @@ class DivarClient:
             }
 
         logger.warning(
-            f"Message to {conversation_id} resulted in status {response.status_code} with no JSON content."
+            "Message to %s resulted in status %s with no JSON content.",
+            conversation_id,
+            response.status_code,
+            extra=log_extra,
         )
         return {"status": response.status_code, "content": response.text}
@@ -1,16 +1,32 @@
 from flask import (
     Flask,
+    Response,
     request,
     jsonify,
+    stream_with_context,
 )
 from divar_client import DivarClient
+import gzip
+import hmac
 import logging
+import threading
+import time
+import zlib
 from command_handler import CommandHandler
+from config import Config
+from log_config import setup_logging
+from webhook_capture import capture_webhook, setup_capture
+import task_export
+import todo_db
 
 # Configure logging
-logging.basicConfig(level=logging.INFO)
+setup_logging()
+setup_capture()
 logger = logging.getLogger(__name__)
 
+# Fail at startup, not on every webhook, if TODO_DB_SHARDS disagrees with the store
+todo_db.get_shard_count()
+
 app = Flask(__name__)
 
 app.secret_key = "a_very_secret_key_for_flask_flashing"
@@ -22,12 +38,40 @@ divar_client = DivarClient()
 command_handler = CommandHandler(divar_client)
 
 
+def _verify_stats_periodically(interval: int):
+    while True:
+        time.sleep(interval)
+        try:
+            todo_db.verify_stats()
+        except Exception:
+            logger.exception("Task counter verification failed")
+
+
+def start_stats_verifier():
+    """
+    Periodically rebuild task counters from the tasks in a background thread.
+    Call once from the server's startup (WSGI servers: e.g. a post-fork hook).
+    """
+    if Config.STATS_VERIFY_INTERVAL > 0:
+        threading.Thread(
+            target=_verify_stats_periodically,
+            args=(Config.STATS_VERIFY_INTERVAL,),
+            daemon=True,
+        ).start()
+
+
 @app.route("/", methods=["POST"])
 def chat_callback():
+    started = time.perf_counter()
     webhook_data = request.json
-    logger.info(
-        f"Received Divar webhook: headers={request.headers}, body={webhook_data}"
-    )
+    capture_webhook(webhook_data)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "Received Divar webhook: headers=%s, body=%s",
+            dict(request.headers),
+            webhook_data,
+            extra={"event": "webhook_received"},
+        )
 
     if webhook_data.get("type") == "NEW_CHATBOT_MESSAGE":
         message_data = webhook_data.get("new_chatbot_message", {})
@@ -39,18 +83,95 @@ def chat_callback():
         ).strip()  # Keep original for descriptions
 
         if not conversation_id or sender_type != "HUMAN":
-            logger.warning(
-                "Ignoring non-human message or message without conversation ID."
+            logger.info(
+                "Ignoring non-human message or message without conversation ID.",
+                extra={"event": "webhook_ignored", "conversation_id": conversation_id},
             )
             return jsonify({"status": "ignored"}), 200
 
         # Delegate message handling to CommandHandler
         command_handler.handle_message(conversation_id, text, original_text)
 
+        logger.info(
+            "Processed chatbot message",
+            extra={
+                "event": "webhook_processed",
+                "conversation_id": conversation_id,
+                "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+            },
+        )
         return jsonify({"status": "processed"}), 200
 
     return jsonify({"status": "unsupported_type"}), 400
 
 
+def _is_admin_request() -> bool:
+    token = request.headers.get("X-Admin-Token", "")
+    return bool(Config.ADMIN_API_TOKEN) and hmac.compare_digest(
+        token, Config.ADMIN_API_TOKEN
+    )
+
+
+def _gzip_stream(chunks):
+    compressor = zlib.compressobj(wbits=31)  # gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode("utf-8"))
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+@app.route("/admin/export", methods=["GET"])
+def admin_export():
+    if not _is_admin_request():
+        return jsonify({"status": "unauthorized"}), 401
+
+    per = request.args.get("per", task_export.RECORDS_PER_TASK)
+    try:
+        lines = task_export.iter_export_lines(per=per)
+        # Surface a bad `per` before the response starts streaming
+        first_line = next(lines, None)
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+
+    def generate():
+        if first_line is not None:
+            yield first_line
+            yield from lines
+
+    headers = {}
+    body = stream_with_context(generate())
+    if request.args.get("gzip") == "1":
+        body = _gzip_stream(body)
+        headers["Content-Encoding"] = "gzip"
+    return Response(body, mimetype="application/x-ndjson", headers=headers)
+
+
+@app.route("/admin/import", methods=["POST"])
+def admin_import():
+    if not _is_admin_request():
+        return jsonify({"status": "unauthorized"}), 401
+
+    stream = request.stream
+    if request.headers.get("Content-Encoding") == "gzip":
+        stream = gzip.GzipFile(fileobj=stream, mode="rb")
+    try:
+        imported = task_export.import_lines(stream)
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    except (OSError, EOFError, zlib.error) as e:
+        # Bodies that claim gzip but are not valid gzip data
+        return jsonify({"status": "error", "message": f"Invalid body: {e}"}), 400
+    return jsonify({"status": "imported", "records": imported}), 200
+
+
+@app.route("/admin/stats", methods=["GET"])
+def admin_stats():
+    if not _is_admin_request():
+        return jsonify({"status": "unauthorized"}), 401
+    return jsonify(todo_db.get_global_stats()), 200
+
+
 if __name__ == "__main__":
+    start_stats_verifier()
     app.run(port=8000, debug=True)
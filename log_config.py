@@ -0,0 +1,161 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import re
+import threading
+import time
+from datetime import datetime, timezone
+
+from config import Config
+
+# Fields passed through `extra=` that are copied into the JSON record.
+STRUCTURED_FIELDS = ("event", "conversation_id", "duration_ms", "status")
+
+REDACTED = "[REDACTED]"
+
+# Matches "key: value", "key=value" and "'key': 'value'" forms for secret-bearing keys.
+_SECRET_PATTERN = re.compile(
+    r"""(?P<key>x-api-key|x-access-token|access_token|refresh_token|client_secret|api_key|authorization)"""
+    r"""(?P<sep>['"]?\s*[:=]\s*['"]?)(?:bearer\s+)?(?P<value>[^'",&\s}]+)""",
+    re.IGNORECASE,
+)
+
+_listener: logging.handlers.QueueListener | None = None
+
+
+def _parse_event_map(raw: str) -> dict[str, float]:
+    """Parse "event=value,event2=value2" settings into a dict."""
+    result = {}
+    for item in filter(None, (part.strip() for part in raw.split(","))):
+        event, _, value = item.partition("=")
+        try:
+            result[event.strip()] = float(value)
+        except ValueError:
+            continue
+    return result
+
+
+def redact(text: str) -> str:
+    """Mask tokens and API keys in a formatted log line."""
+    text = _SECRET_PATTERN.sub(
+        lambda m: f"{m.group('key')}{m.group('sep')}{REDACTED}", text
+    )
+    for secret in (Config.DIVAR_API_KEY, Config.DIVAR_OAUTH_SECRET):
+        if secret:
+            text = text.replace(secret, REDACTED)
+    return text
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats a record as a single-line JSON object with structured fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": redact(record.getMessage()),
+        }
+        for field in STRUCTURED_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                payload[field] = value
+        if record.exc_info:
+            payload["exc_info"] = redact(self.formatException(record.exc_info))
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Drops a share of records per event and rate limits noisy events.
+    Records without an `event` extra are always kept. Warnings and above are never dropped.
+    """
+
+    def __init__(self, sample_rates: dict[str, float], rate_limits: dict[str, float]):
+        super().__init__()
+        self.sample_rates = sample_rates
+        self.rate_limits = rate_limits
+        # event -> (available tokens, last refill time)
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def _take_token(self, event: str, per_second: float) -> bool:
+        now = time.monotonic()
+        # Rates below one per second still need room for a whole token
+        capacity = max(1.0, per_second)
+        with self._lock:
+            tokens, last = self._buckets.get(event, (capacity, now))
+            tokens = min(capacity, tokens + (now - last) * per_second)
+            if tokens < 1:
+                self._buckets[event] = (tokens, now)
+                return False
+            self._buckets[event] = (tokens - 1, now)
+            return True
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        event = getattr(record, "event", None)
+        if event is None or record.levelno >= logging.WARNING:
+            return True
+        rate = self.sample_rates.get(event)
+        if rate is not None and random.random() >= rate:
+            return False
+        per_second = self.rate_limits.get(event)
+        if per_second is not None and not self._take_token(event, per_second):
+            return False
+        return True
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Enqueues records without formatting them, so message interpolation,
+    redaction and JSON encoding happen on the listener thread.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def setup_logging() -> None:
+    """
+    Route the root logger through a queue to a background writer thread.
+    Safe to call more than once; only the first call configures logging.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    if Config.LOG_FILE:
+        target = logging.FileHandler(Config.LOG_FILE, encoding="utf-8")
+    else:
+        target = logging.StreamHandler()
+    target.setFormatter(JsonFormatter())
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = _DeferredQueueHandler(log_queue)
+    queue_handler.addFilter(
+        SamplingFilter(
+            _parse_event_map(Config.LOG_SAMPLE_RATES),
+            _parse_event_map(Config.LOG_RATE_LIMITS),
+        )
+    )
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(Config.LOG_LEVEL)
+
+    _listener = logging.handlers.QueueListener(log_queue, target)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the background writer."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,198 @@
+import argparse
+import json
+import os
+import queue
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeDivarHandler(BaseHTTPRequestHandler):
+    """Accepts any Divar API call and answers with an empty JSON object."""
+
+    latency_seconds = 0.0
+
+    def _respond(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        if self.latency_seconds:
+            time.sleep(self.latency_seconds)
+        body = b"{}"
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = _respond
+    do_POST = _respond
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_fake_divar_api(latency_ms: float) -> ThreadingHTTPServer:
+    FakeDivarHandler.latency_seconds = latency_ms / 1000
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeDivarHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = max(
+        0, min(len(sorted_values) - 1, round(fraction * len(sorted_values)) - 1)
+    )
+    return sorted_values[index]
+
+
+def _conversation_id(payload: dict) -> str:
+    message_data = payload.get("new_chatbot_message", {})
+    return str(message_data.get("conversation", {}).get("id", ""))
+
+
+def replay(app, captures, speed: float, concurrency: int) -> dict:
+    """
+    Post captured webhooks to the app, keeping their original spacing divided by `speed`.
+    A speed of 0 sends them as fast as the workers allow.
+    Each conversation is pinned to one worker, so its messages arrive in capture order
+    while different conversations are handled in parallel.
+    Latency is measured from each webhook's scheduled send time, so a backlog shows up in it.
+    """
+    latencies = []
+    statuses = Counter()
+    results_lock = threading.Lock()
+
+    def work(inbox):
+        client = app.test_client()
+        while (item := inbox.get()) is not None:
+            payload, scheduled_at = item
+            response = client.post("/", json=payload)
+            elapsed_ms = (time.perf_counter() - scheduled_at) * 1000
+            with results_lock:
+                latencies.append(elapsed_ms)
+                statuses[response.status_code] += 1
+
+    inboxes = [queue.SimpleQueue() for _ in range(max(1, concurrency))]
+    workers = [threading.Thread(target=work, args=(inbox,)) for inbox in inboxes]
+    for worker in workers:
+        worker.start()
+
+    replay_started = time.perf_counter()
+    first_ts = None
+    try:
+        for ts, payload in captures:
+            if speed > 0:
+                if first_ts is None:
+                    first_ts = ts
+                scheduled_at = replay_started + (ts - first_ts) / speed
+                delay = scheduled_at - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            else:
+                scheduled_at = time.perf_counter()
+            worker_index = zlib.crc32(_conversation_id(payload).encode("utf-8"))
+            inboxes[worker_index % len(inboxes)].put((payload, scheduled_at))
+    finally:
+        for inbox in inboxes:
+            inbox.put(None)
+        for worker in workers:
+            worker.join()
+    wall_seconds = time.perf_counter() - replay_started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "statuses": dict(statuses),
+        "wall_seconds": round(wall_seconds, 3),
+        "requests_per_second": (
+            round(len(latencies) / wall_seconds, 2) if wall_seconds else 0.0
+        ),
+        "latency_ms": {
+            "p50": round(percentile(latencies, 0.50), 2),
+            "p90": round(percentile(latencies, 0.90), 2),
+            "p99": round(percentile(latencies, 0.99), 2),
+            "max": round(latencies[-1], 2) if latencies else 0.0,
+        },
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Replay captured Divar webhooks against a local copy of the bot."
+    )
+    parser.add_argument(
+        "captures",
+        nargs="+",
+        help="Capture files, oldest first (e.g. capture.ndjson.1 capture.ndjson).",
+    )
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="Replay speed: 1 = real time, N = N times faster, 0 = as fast as possible.",
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=8, help="Webhooks handled in parallel."
+    )
+    parser.add_argument(
+        "--data-dir", help="Storage directory for the replay (default: a new temp dir)."
+    )
+    parser.add_argument(
+        "--shards",
+        type=int,
+        help="Shard count for a fresh store; an existing --data-dir keeps its own.",
+    )
+    parser.add_argument(
+        "--fake-api-latency-ms",
+        type=float,
+        default=0.0,
+        help="Delay added by the fake Divar API to every call.",
+    )
+    return parser
+
+
+def main():
+    args = build_parser().parse_args()
+    fake_api = start_fake_divar_api(args.fake_api_latency_ms)
+    fake_api_url = f"http://127.0.0.1:{fake_api.server_address[1]}"
+
+    # Config is read at import time, so the environment is set up before the app loads
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    if args.shards is not None:
+        os.environ["TODO_DB_SHARDS"] = str(args.shards)
+    os.environ.update(
+        {
+            "TODO_DB_DIR": args.data_dir or tempfile.mkdtemp(prefix="todo_replay_"),
+            "DIVAR_API_BASE_URL": fake_api_url,
+            "DIVAR_OPEN_API_BASE_URL": fake_api_url,
+            "DIVAR_API_KEY": os.environ.get("DIVAR_API_KEY") or "replay",
+            "WEBHOOK_CAPTURE_FILE": "",
+        }
+    )
+    import divar_panel
+    import todo_db
+    from webhook_capture import iter_captures
+
+    report = replay(
+        divar_panel.app, iter_captures(args.captures), args.speed, args.concurrency
+    )
+    report["storage"] = {
+        "data_dir": os.environ["TODO_DB_DIR"],
+        "shards": todo_db.get_shard_count(),
+        "stats_drifted_shards": todo_db.verify_stats(),
+        **todo_db.get_global_stats(),
+    }
+    fake_api.shutdown()
+    json.dump(report, sys.stdout, indent=4)
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+import json
+import logging
+import tempfile
+from typing import Iterable, Iterator
+
+import todo_db
+
+logger = logging.getLogger(__name__)
+
+RECORDS_PER_CONVERSATION = "conversation"
+RECORDS_PER_TASK = "task"
+IMPORT_BATCH_SIZE = 1000
+# Validated input is kept in memory up to this size, then spooled to disk
+IMPORT_SPOOL_BYTES = 8 * 1024 * 1024
+
+
+def _records_for(conversation_id: str, tasks: list, per: str) -> Iterator[dict]:
+    if per == RECORDS_PER_CONVERSATION:
+        yield {"conversation_id": conversation_id, "tasks": tasks}
+        return
+    for task in tasks:
+        yield {"conversation_id": conversation_id, **task}
+
+
+def iter_export_lines(
+    per: str = RECORDS_PER_TASK, conversation_id: str | None = None
+) -> Iterator[str]:
+    """
+    Yield NDJSON lines (with trailing newline) for the whole store,
+    or only for `conversation_id` when given.
+    """
+    if per not in (RECORDS_PER_CONVERSATION, RECORDS_PER_TASK):
+        raise ValueError(f"Unknown record granularity: {per}")
+
+    if conversation_id is not None:
+        conversations = [(conversation_id, todo_db.get_tasks(conversation_id))]
+    else:
+        conversations = todo_db.iter_all_tasks()
+
+    for conv_id, tasks in conversations:
+        for record in _records_for(conv_id, tasks, per):
+            yield json.dumps(record, ensure_ascii=False) + "\n"
+
+
+def _validate_task(task, line_number: int):
+    if not isinstance(task, dict) or not isinstance(task.get("description"), str):
+        raise ValueError(f"Line {line_number} has a task without a description.")
+
+
+def _validate_record(record, line_number: int):
+    if not isinstance(record, dict) or not isinstance(
+        record.get("conversation_id"), str
+    ):
+        raise ValueError(f"Line {line_number} is not a task export record.")
+    if "tasks" in record:
+        if not isinstance(record["tasks"], list):
+            raise ValueError(f'Line {line_number} has a non-list "tasks" field.')
+        for task in record["tasks"]:
+            _validate_task(task, line_number)
+    else:
+        _validate_task(record, line_number)
+
+
+def import_lines(
+    lines: Iterable[str | bytes], batch_size: int = IMPORT_BATCH_SIZE
+) -> int:
+    """
+    Bulk-load NDJSON export lines in batches; each batch is written with one
+    transaction per touched shard. Every conversation in the input has its
+    task list replaced by the imported tasks, whichever record granularity
+    was exported; other conversations are left alone. The whole input is
+    validated before the first batch is written, so an invalid line leaves
+    the store untouched. Returns the number of records imported.
+    """
+    with tempfile.SpooledTemporaryFile(
+        max_size=IMPORT_SPOOL_BYTES, mode="w+", encoding="utf-8"
+    ) as spool:
+        for line_number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid JSON on line {line_number}: {e}") from e
+            _validate_record(record, line_number)
+            spool.write(json.dumps(record, ensure_ascii=False) + "\n")
+        spool.seek(0)
+
+        imported = 0
+        batch = []
+        replaced_conversations = set()
+        for line in spool:
+            batch.append(json.loads(line))
+            if len(batch) >= batch_size:
+                imported += todo_db.bulk_import_tasks(batch, replaced_conversations)
+                batch = []
+        if batch:
+            imported += todo_db.bulk_import_tasks(batch, replaced_conversations)
+    logger.info("Imported %s records", imported, extra={"event": "tasks_imported"})
+    return imported
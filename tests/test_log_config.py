@@ -0,0 +1,115 @@
+import json
+import logging
+import sys
+import unittest
+from unittest import mock
+
+import log_config
+from config import Config
+
+
+def make_record(message, *args, level=logging.INFO, exc_info=None, **extra):
+    record = logging.LogRecord("test", level, __file__, 1, message, args, exc_info)
+    for key, value in extra.items():
+        setattr(record, key, value)
+    return record
+
+
+class RedactTest(unittest.TestCase):
+    def test_masks_secret_bearing_keys(self):
+        for text, expected in (
+            ("x-api-key: abc123", "x-api-key: [REDACTED]"),
+            ("access_token=abc123&x=1", "access_token=[REDACTED]&x=1"),
+            ("{'refresh_token': 'abc123'}", "{'refresh_token': '[REDACTED]'}"),
+            ("Authorization: Bearer abc123", "Authorization: [REDACTED]"),
+        ):
+            with self.subTest(text=text):
+                self.assertEqual(log_config.redact(text), expected)
+
+    def test_masks_configured_secrets_anywhere(self):
+        with mock.patch.object(Config, "DIVAR_API_KEY", "divar-key-42"):
+            self.assertEqual(
+                log_config.redact("calling with divar-key-42 now"),
+                "calling with [REDACTED] now",
+            )
+
+    def test_leaves_other_text_alone(self):
+        self.assertEqual(
+            log_config.redact("task added: buy milk"), "task added: buy milk"
+        )
+
+
+class JsonFormatterTest(unittest.TestCase):
+    def test_structured_fields(self):
+        record = make_record(
+            "sent %s",
+            "hello",
+            event="divar_send_message",
+            conversation_id="c1",
+            duration_ms=12.5,
+            unrelated="dropped",
+        )
+
+        payload = json.loads(log_config.JsonFormatter().format(record))
+
+        self.assertEqual(payload["message"], "sent hello")
+        self.assertEqual(payload["level"], "INFO")
+        self.assertEqual(payload["event"], "divar_send_message")
+        self.assertEqual(payload["conversation_id"], "c1")
+        self.assertEqual(payload["duration_ms"], 12.5)
+        self.assertNotIn("status", payload)
+        self.assertNotIn("unrelated", payload)
+
+    def test_exc_info_is_redacted(self):
+        try:
+            raise ValueError("api_key=abc123")
+        except ValueError:
+            record = make_record("failed", level=logging.ERROR, exc_info=sys.exc_info())
+
+        payload = json.loads(log_config.JsonFormatter().format(record))
+
+        self.assertIn("ValueError", payload["exc_info"])
+        self.assertNotIn("abc123", payload["exc_info"])
+
+
+class SamplingFilterTest(unittest.TestCase):
+    def test_records_without_event_or_at_warning_are_kept(self):
+        log_filter = log_config.SamplingFilter({"noisy": 0.0}, {"noisy": 0.1})
+
+        self.assertTrue(log_filter.filter(make_record("plain")))
+        self.assertTrue(
+            log_filter.filter(make_record("bad", level=logging.WARNING, event="noisy"))
+        )
+        self.assertFalse(log_filter.filter(make_record("noise", event="noisy")))
+
+    def test_sample_rate(self):
+        log_filter = log_config.SamplingFilter({"noisy": 0.5}, {})
+
+        with mock.patch.object(log_config.random, "random", side_effect=[0.2, 0.7]):
+            self.assertTrue(log_filter.filter(make_record("kept", event="noisy")))
+            self.assertFalse(log_filter.filter(make_record("dropped", event="noisy")))
+
+    def test_rate_limit(self):
+        log_filter = log_config.SamplingFilter({}, {"noisy": 2})
+
+        with mock.patch.object(log_config.time, "monotonic", return_value=100.0):
+            kept = [
+                log_filter.filter(make_record("x", event="noisy")) for _ in range(5)
+            ]
+        self.assertEqual(kept, [True, True, False, False, False])
+
+        with mock.patch.object(log_config.time, "monotonic", return_value=100.5):
+            self.assertTrue(log_filter.filter(make_record("x", event="noisy")))
+
+    def test_rate_limit_below_one_per_second(self):
+        log_filter = log_config.SamplingFilter({}, {"noisy": 0.5})
+        kept = []
+        for now in (0.0, 0.5, 1.0, 1.5, 2.0, 2.5, 3.0, 3.5):
+            with mock.patch.object(log_config.time, "monotonic", return_value=now):
+                kept.append(log_filter.filter(make_record("x", event="noisy")))
+
+        self.assertEqual(kept, [True, False, False, False, True, False, False, False])
+
+
+if __name__ == "__main__":
+    unittest.main()
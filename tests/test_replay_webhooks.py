@@ -0,0 +1,48 @@
+import threading
+import time
+import unittest
+
+from flask import Flask, request
+
+from replay_webhooks import replay
+
+
+class ReplayTest(unittest.TestCase):
+    def test_keeps_order_within_each_conversation(self):
+        app = Flask(__name__)
+        received = {}
+        received_lock = threading.Lock()
+
+        @app.route("/", methods=["POST"])
+        def webhook():
+            message = request.get_json()["new_chatbot_message"]
+            # Early messages are slowest, so a reordering pool would show it
+            time.sleep(0.005 * (3 - message["text"]))
+            with received_lock:
+                received.setdefault(message["conversation"]["id"], []).append(
+                    message["text"]
+                )
+            return "", 200
+
+        captures = [
+            (
+                0.0,
+                {
+                    "new_chatbot_message": {
+                        "conversation": {"id": f"c{conversation}"},
+                        "text": n,
+                    }
+                },
+            )
+            for n in range(3)
+            for conversation in range(6)
+        ]
+        report = replay(app, captures, speed=0, concurrency=4)
+
+        self.assertEqual(report["requests"], 18)
+        self.assertEqual(report["statuses"], {200: 18})
+        self.assertEqual(received, {f"c{c}": [0, 1, 2] for c in range(6)})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import json
+import tempfile
+import unittest
+from unittest import mock
+
+import task_export
+import todo_db
+from config import Config
+
+
+class TaskExportTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        patches = [
+            mock.patch.object(Config, "TODO_DB_DIR", self._tmp.name),
+            mock.patch.object(Config, "TODO_DB_SHARDS", None),
+            mock.patch.object(todo_db, "_store_ready", False),
+            mock.patch.object(todo_db, "_manifest_cache", None),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.addCleanup(self._tmp.cleanup)
+
+        todo_db.reshard(3)
+        for conversation in range(5):
+            for i in range(4):
+                todo_db.add_task_item(f"c{conversation}", f"task {i}")
+        todo_db.mark_task_item_done("c1", 2)
+
+    def snapshot(self):
+        return {f"c{n}": todo_db.get_tasks(f"c{n}") for n in range(5)}
+
+    def test_reimport_is_idempotent_for_both_formats(self):
+        original = self.snapshot()
+        for per in (task_export.RECORDS_PER_TASK, task_export.RECORDS_PER_CONVERSATION):
+            lines = list(task_export.iter_export_lines(per=per))
+            task_export.import_lines(lines, batch_size=3)
+            task_export.import_lines(lines, batch_size=3)
+            self.assertEqual(self.snapshot(), original)
+        self.assertEqual(todo_db.get_global_stats()["total"], 20)
+
+    def test_import_replaces_only_conversations_in_input(self):
+        task_export.import_lines(
+            [json.dumps({"conversation_id": "c0", "description": "restored"})]
+        )
+
+        self.assertEqual(
+            [task["description"] for task in todo_db.get_tasks("c0")], ["restored"]
+        )
+        self.assertEqual(len(todo_db.get_tasks("c1")), 4)
+
+    def test_rejects_malformed_records(self):
+        for line in (
+            "5",
+            '{"conversation_id": 5, "description": "x"}',
+            '{"conversation_id": "z", "tasks": [1]}',
+            '{"conversation_id": "z", "tasks": {"description": "x"}}',
+            '{"conversation_id": "z"}',
+        ):
+            with self.subTest(line=line), self.assertRaises(ValueError):
+                task_export.import_lines([line])
+        self.assertEqual(todo_db.get_tasks("z"), [])
+
+    def test_invalid_line_leaves_store_untouched(self):
+        original = self.snapshot()
+        lines = [
+            json.dumps({"conversation_id": "c0", "description": "restored"}),
+            json.dumps({"conversation_id": "c1", "tasks": []}),
+            '{"conversation_id": "c2", "description": ',
+        ]
+
+        with self.assertRaises(ValueError):
+            task_export.import_lines(lines, batch_size=1)
+        self.assertEqual(self.snapshot(), original)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,227 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+import todo_db
+from config import Config
+
+
+class TodoDbTestCase(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.data_dir = os.path.join(self._tmp.name, "data")
+        patches = [
+            mock.patch.object(Config, "TODO_DB_DIR", self.data_dir),
+            mock.patch.object(Config, "TODO_DB_SHARDS", None),
+            mock.patch.object(todo_db, "_store_ready", False),
+            mock.patch.object(todo_db, "_manifest_cache", None),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.addCleanup(self._tmp.cleanup)
+
+    def data_path(self, filename):
+        return os.path.join(self.data_dir, filename)
+
+
+class ShardingTest(TodoDbTestCase):
+    def test_creates_missing_data_dir(self):
+        todo_db.add_task_item("c1", "first")
+
+        self.assertEqual(todo_db.get_tasks("c1")[0]["description"], "first")
+        self.assertTrue(os.path.exists(self.data_path(todo_db.SHARD_MANIFEST_FILE)))
+
+    def test_existing_single_file_store_is_kept(self):
+        os.makedirs(self.data_dir)
+        with open(self.data_path(todo_db.TASKS_DB_FILE), "w") as f:
+            json.dump({"old": [{"description": "kept", "done": False, "id": 1}]}, f)
+
+        self.assertEqual(todo_db.get_shard_count(), 1)
+        self.assertEqual(len(todo_db.get_tasks("old")), 1)
+
+    def test_refuses_shard_count_that_disagrees_with_store(self):
+        todo_db.add_task_item("c1", "first")
+        todo_db._store_ready = False
+
+        with mock.patch.object(Config, "TODO_DB_SHARDS", 4):
+            with self.assertRaises(RuntimeError):
+                todo_db.get_tasks("c1")
+
+    def test_rejects_unknown_shard(self):
+        todo_db.reshard(4)
+
+        with self.assertRaises(ValueError):
+            todo_db.compact_shard(4)
+        with self.assertRaises(ValueError):
+            todo_db.backup_shard(-1, self.data_path("backups"))
+        self.assertFalse(os.path.exists(self.data_path("tasks-004-of-004.json")))
+
+    def test_reshard_removes_old_files(self):
+        todo_db.add_task_item("c1", "first")
+        todo_db.reshard(3)
+
+        leftovers = {name for name in os.listdir(self.data_dir) if "-of-" not in name}
+        self.assertEqual(
+            leftovers,
+            {todo_db.SHARD_MANIFEST_FILE, f"{todo_db.SHARD_MANIFEST_FILE}.lock"},
+        )
+        self.assertEqual(len(todo_db.get_tasks("c1")), 1)
+
+    def test_concurrent_writers_during_reshard(self):
+        writers, tasks_per_writer = 8, 40
+
+        def write(writer):
+            for i in range(tasks_per_writer):
+                todo_db.add_task_item(f"conversation-{writer}", f"task {i}")
+
+        threads = [threading.Thread(target=write, args=(n,)) for n in range(writers)]
+        for thread in threads:
+            thread.start()
+        todo_db.reshard(4)
+        todo_db.reshard(2)
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(todo_db.get_shard_count(), 2)
+        for writer in range(writers):
+            tasks = todo_db.get_tasks(f"conversation-{writer}")
+            self.assertEqual(
+                [task["description"] for task in tasks],
+                [f"task {i}" for i in range(tasks_per_writer)],
+            )
+
+    def test_concurrent_reshards_keep_data(self):
+        for i in range(200):
+            todo_db.add_task_item(f"conversation-{i % 20}", f"task {i}")
+
+        threads = [
+            threading.Thread(target=todo_db.reshard, args=(count,))
+            for count in (4, 2, 3)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertIn(todo_db.get_shard_count(), (4, 2, 3))
+        self.assertEqual(todo_db.get_global_stats()["total"], 200)
+        self.assertEqual(todo_db.verify_stats(), 0)
+        for conversation in range(20):
+            tasks = todo_db.get_tasks(f"conversation-{conversation}")
+            self.assertEqual(
+                [task["description"] for task in tasks],
+                [f"task {i}" for i in range(conversation, 200, 20)],
+            )
+
+
+class StatsTest(TodoDbTestCase):
+    def write_legacy_tasks(self):
+        os.makedirs(self.data_dir)
+        with open(self.data_path(todo_db.TASKS_DB_FILE), "w") as f:
+            json.dump(
+                {
+                    "legacy": [
+                        {"description": "pending", "done": False, "id": 1},
+                        {"description": "done", "done": True, "id": 2},
+                    ]
+                },
+                f,
+            )
+
+    def test_counters_built_for_existing_tasks(self):
+        self.write_legacy_tasks()
+
+        todo_db.delete_task_item("legacy", 2)
+
+        self.assertEqual(
+            todo_db.get_conversation_stats("legacy"),
+            {"pending": 1, "done": 0, "total": 1, "completion_rate": 0.0},
+        )
+        self.assertEqual(todo_db.get_global_stats()["total"], 1)
+
+    def test_counters_follow_task_changes(self):
+        todo_db.reshard(3)
+        for conversation in ("a", "b", "c"):
+            for i in range(3):
+                todo_db.add_task_item(conversation, f"task {i}")
+        todo_db.mark_task_item_done("a", 1)
+        todo_db.mark_task_item_done("a", 1)
+        todo_db.delete_task_item("b", 3)
+        todo_db.save_tasks("c", [])
+
+        self.assertEqual(
+            todo_db.get_conversation_stats("a"),
+            {"pending": 2, "done": 1, "total": 3, "completion_rate": 0.3333},
+        )
+        self.assertEqual(
+            todo_db.get_global_stats(),
+            {
+                "pending": 4,
+                "done": 1,
+                "total": 5,
+                "completion_rate": 0.2,
+                "conversations": 2,
+            },
+        )
+        self.assertEqual(todo_db.verify_stats(), 0)
+
+    def test_verify_repairs_drifted_counters(self):
+        todo_db.add_task_item("c1", "first")
+        todo_db.add_task_item("c1", "second")
+        # Written the way another process would, bypassing this one's cache
+        todo_db._save_json(
+            self.data_path(todo_db.STATS_DB_FILE), {"c1": {"pending": 7, "done": 0}}
+        )
+        todo_db._save_json(
+            self.data_path(todo_db.TOTALS_DB_FILE),
+            {"pending": 7, "done": 0, "conversations": 1},
+        )
+
+        self.assertEqual(todo_db.get_conversation_stats("c1")["pending"], 7)
+        self.assertEqual(todo_db.verify_stats(), 1)
+        self.assertEqual(todo_db.get_conversation_stats("c1")["pending"], 2)
+        self.assertEqual(todo_db.get_global_stats()["pending"], 2)
+        self.assertEqual(todo_db.verify_stats(), 0)
+
+    def test_global_stats_during_reshard(self):
+        for i in range(100):
+            todo_db.add_task_item(f"conversation-{i % 10}", f"task {i}")
+        totals = []
+        resharding = threading.Event()
+
+        def read_stats():
+            while not resharding.is_set():
+                totals.append(todo_db.get_global_stats()["total"])
+
+        reader = threading.Thread(target=read_stats)
+        reader.start()
+        for shard_count in (4, 2, 3, 1):
+            todo_db.reshard(shard_count)
+        resharding.set()
+        reader.join()
+
+        self.assertEqual(set(totals), {100})
+        # No counters were written for layouts that no longer exist
+        self.assertEqual(
+            {
+                name
+                for name in os.listdir(self.data_dir)
+                if "-of-" in name and not name.endswith(".lock")
+            },
+            set(),
+        )
+
+    def test_reshard_carries_counters(self):
+        self.write_legacy_tasks()
+        todo_db.reshard(4)
+
+        self.assertEqual(todo_db.get_global_stats()["total"], 2)
+        self.assertEqual(todo_db.verify_stats(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import webhook_capture
+from config import Config
+
+
+class WebhookCaptureTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.capture_file = os.path.join(self._tmp.name, "capture.ndjson")
+
+    def start_capture(self, max_bytes=0, backups=0):
+        patches = [
+            mock.patch.object(Config, "WEBHOOK_CAPTURE_FILE", self.capture_file),
+            mock.patch.object(Config, "WEBHOOK_CAPTURE_MAX_BYTES", max_bytes),
+            mock.patch.object(Config, "WEBHOOK_CAPTURE_BACKUPS", backups),
+            mock.patch.object(webhook_capture, "CAPTURE_FLUSH_SECONDS", 0.05),
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+        self.assertTrue(webhook_capture.setup_capture())
+        self.addCleanup(webhook_capture.shutdown_capture)
+
+    def captured_numbers(self):
+        """The "n" of every capture across the rotated files, oldest first."""
+        backups = sorted(
+            (name for name in os.listdir(self._tmp.name) if name != "capture.ndjson"),
+            key=lambda name: int(name.rsplit(".", 1)[1]),
+            reverse=True,
+        )
+        paths = [os.path.join(self._tmp.name, name) for name in backups]
+        paths.append(self.capture_file)
+        return [payload["n"] for _, payload in webhook_capture.iter_captures(paths)]
+
+    def test_flushes_on_timer(self):
+        self.start_capture()
+        webhook_capture.capture_webhook({"type": "NEW_CHATBOT_MESSAGE"})
+
+        deadline = time.monotonic() + 2
+        while time.monotonic() < deadline and not os.path.getsize(self.capture_file):
+            time.sleep(0.01)
+
+        captures = list(webhook_capture.iter_captures([self.capture_file]))
+        self.assertEqual(
+            [payload for _, payload in captures], [{"type": "NEW_CHATBOT_MESSAGE"}]
+        )
+
+    def test_rotates_and_keeps_every_capture(self):
+        self.start_capture(max_bytes=200, backups=10)
+        for i in range(20):
+            webhook_capture.capture_webhook({"n": i})
+        webhook_capture.shutdown_capture()
+
+        self.assertTrue(os.path.exists(f"{self.capture_file}.1"))
+        self.assertEqual(self.captured_numbers(), list(range(20)))
+
+    def test_failed_rotation_keeps_writer_running(self):
+        self.start_capture(max_bytes=200, backups=10)
+        real_replace = os.replace
+        failures = iter([OSError("disk busy")])
+
+        def flaky_replace(source, target):
+            error = next(failures, None)
+            if error is not None:
+                raise error
+            real_replace(source, target)
+
+        with mock.patch.object(webhook_capture.os, "replace", flaky_replace):
+            with self.assertLogs(webhook_capture.logger, "ERROR"):
+                for i in range(20):
+                    webhook_capture.capture_webhook({"n": i})
+                webhook_capture.shutdown_capture()
+
+        self.assertEqual(self.captured_numbers(), list(range(20)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,11 +1,32 @@
 import json
-import os
 import logging
+import os
+import shutil
+import threading
+import zlib
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:  # Windows: locks only cover threads of this process
+    fcntl = None
+
+from config import Config
 
 logger = logging.getLogger(__name__)
 
 TASKS_DB_FILE = "tasks.json"
 STATES_DB_FILE = "conversation_states.json"
+STATS_DB_FILE = "task_stats.json"
+TOTALS_DB_FILE = "task_totals.json"
+SHARD_MANIFEST_FILE = "shards.json"
+
+_locks: dict[str, threading.Lock] = {}
+_locks_guard = threading.Lock()
+_store_ready = False
+_store_ready_guard = threading.Lock()
+_manifest_cache: tuple[tuple[int, int], int] | None = None  # ((mtime_ns, ino), count)
 
 
 # Helper to load JSON data from a file
@@ -21,11 +42,450 @@ def _load_json(filepath):
 
 # Helper to save JSON data to a file
 def _save_json(filepath, data):
+    tmp_path = f"{filepath}.tmp"
     try:
-        with open(filepath, "w") as f:
+        with open(tmp_path, "w") as f:
             json.dump(data, f, indent=4)
+        # Readers and backups never observe a half-written file
+        os.replace(tmp_path, filepath)
     except IOError as e:
-        logger.error(f"Error saving JSON to {filepath}: {e}")
+        logger.error("Error saving JSON to %s: %s", filepath, e)
+
+
+# --- Sharding ---
+
+
+def _db_path(filename: str) -> str:
+    return os.path.join(Config.TODO_DB_DIR, filename)
+
+
+def _ensure_store():
+    """
+    Create the data directory and shard manifest on first use.
+    An existing single-file store is recorded as one shard, and a configured
+    shard count that disagrees with the manifest is refused rather than
+    silently routing conversations away from their data.
+    """
+    global _store_ready
+    if _store_ready:
+        return
+    with _store_ready_guard:
+        if _store_ready:
+            return
+        os.makedirs(Config.TODO_DB_DIR, exist_ok=True)
+        manifest_path = _db_path(SHARD_MANIFEST_FILE)
+        with _locked(manifest_path):
+            shard_count = _load_json(manifest_path).get("shards")
+            if shard_count is None:
+                if os.path.exists(_db_path(TASKS_DB_FILE)) or os.path.exists(
+                    _db_path(STATES_DB_FILE)
+                ):
+                    shard_count = 1
+                else:
+                    shard_count = Config.TODO_DB_SHARDS or 1
+                _save_json(manifest_path, {"shards": shard_count})
+        if Config.TODO_DB_SHARDS is not None and Config.TODO_DB_SHARDS != shard_count:
+            raise RuntimeError(
+                f"TODO_DB_SHARDS={Config.TODO_DB_SHARDS} but the store in "
+                f"{Config.TODO_DB_DIR} has {shard_count} shard(s). Run "
+                f"`python admin_cli.py reshard {Config.TODO_DB_SHARDS}` to change it."
+            )
+        _store_ready = True
+
+
+def get_shard_count() -> int:
+    """Current number of shards, as recorded in the manifest."""
+    global _manifest_cache
+    _ensure_store()
+    manifest_path = _db_path(SHARD_MANIFEST_FILE)
+    manifest_stat = os.stat(manifest_path)
+    # os.replace gives every manifest version a new inode, so this also
+    # catches rewrites within the filesystem's timestamp granularity
+    cache_key = (manifest_stat.st_mtime_ns, manifest_stat.st_ino)
+    if _manifest_cache is None or _manifest_cache[0] != cache_key:
+        _manifest_cache = (cache_key, _load_json(manifest_path)["shards"])
+    return _manifest_cache[1]
+
+
+def get_shard_index(conversation_id: str, shard_count: int) -> int:
+    """Stable (process-independent) shard index for a conversation."""
+    return zlib.crc32(conversation_id.encode("utf-8")) % shard_count
+
+
+def get_shard_path(base_filename: str, shard: int, shard_count: int) -> str:
+    """
+    Path of one shard of a database file.
+    A single shard keeps the original file name, so existing data is picked up as-is.
+    """
+    if shard_count == 1:
+        return _db_path(base_filename)
+    stem, ext = os.path.splitext(base_filename)
+    return _db_path(f"{stem}-{shard:03d}-of-{shard_count:03d}{ext}")
+
+
+@contextmanager
+def _locked(filepath: str):
+    """Exclusive lock on a shard file, held across threads and processes."""
+    with _locks_guard:
+        thread_lock = _locks.setdefault(filepath, threading.Lock())
+    with thread_lock:
+        if fcntl is None:
+            yield
+            return
+        with open(f"{filepath}.lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _current_shard_path(base_filename: str, conversation_id: str) -> str:
+    shard_count = get_shard_count()
+    return get_shard_path(
+        base_filename, get_shard_index(conversation_id, shard_count), shard_count
+    )
+
+
+@contextmanager
+def _locked_shard(base_filename: str, conversation_id: str):
+    """
+    Hold the lock of the shard holding `conversation_id` and yield its path.
+    If the store is resharded while waiting for the lock, the new layout is used.
+    """
+    while True:
+        filepath = _current_shard_path(base_filename, conversation_id)
+        with _locked(filepath):
+            if _current_shard_path(base_filename, conversation_id) != filepath:
+                continue
+            yield filepath
+            return
+
+
+@contextmanager
+def _shard_data(base_filename: str, conversation_id: str, write: bool = True):
+    """Load the shard holding `conversation_id` under its lock and save it on exit."""
+    with _locked_shard(base_filename, conversation_id) as filepath:
+        data = _load_json(filepath)
+        yield data
+        if write:
+            _save_json(filepath, data)
+
+
+@contextmanager
+def _tasks_transaction(conversation_id: str):
+    """
+    Load a tasks shard together with its counters under the shard's lock,
+    and save both on exit so counters change with the tasks they describe.
+    The files are replaced one after the other; counters left behind by a
+    crash in between are repaired by verify_stats().
+    """
+    with _locked_shard(TASKS_DB_FILE, conversation_id) as tasks_path:
+        # The layout cannot change while the tasks shard lock is held
+        shard_count = get_shard_count()
+        shard = get_shard_index(conversation_id, shard_count)
+        all_tasks_data = _load_json(tasks_path)
+        stats = _load_shard_stats(shard, shard_count, all_tasks_data)
+        yield all_tasks_data, stats
+        _save_json(tasks_path, all_tasks_data)
+        _save_shard_stats(shard, shard_count, stats)
+
+
+def _check_shard(shard: int, shard_count: int):
+    if not 0 <= shard < shard_count:
+        raise ValueError(
+            f"Shard {shard} does not exist; the store has {shard_count} shard(s)."
+        )
+
+
+def compact_shard(shard: int):
+    """Drop empty task lists from a shard and rewrite its files."""
+    shard_count = get_shard_count()
+    _check_shard(shard, shard_count)
+    for base_filename in (TASKS_DB_FILE, STATES_DB_FILE):
+        filepath = get_shard_path(base_filename, shard, shard_count)
+        with _locked(filepath):
+            data = _load_json(filepath)
+            compacted = {key: value for key, value in data.items() if value}
+            _save_json(filepath, compacted)
+        logger.info(
+            "Compacted %s: %s -> %s entries", filepath, len(data), len(compacted)
+        )
+
+
+def backup_shard(shard: int, backup_dir: str) -> list[str]:
+    """Copy a consistent snapshot of a shard's files into `backup_dir`."""
+    shard_count = get_shard_count()
+    _check_shard(shard, shard_count)
+    suffix = datetime.now().strftime("%Y%m%d%H%M%S")
+    os.makedirs(backup_dir, exist_ok=True)
+    backup_paths = []
+    # Counters are guarded by the tasks shard lock, so they are copied under it
+    for base_filenames in (
+        (TASKS_DB_FILE, STATS_DB_FILE, TOTALS_DB_FILE),
+        (STATES_DB_FILE,),
+    ):
+        filepaths = [
+            get_shard_path(base_filename, shard, shard_count)
+            for base_filename in base_filenames
+        ]
+        with _locked(filepaths[0]):
+            for filepath in filepaths:
+                if not os.path.exists(filepath):
+                    continue
+                backup_path = os.path.join(
+                    backup_dir, f"{os.path.basename(filepath)}.{suffix}"
+                )
+                shutil.copy2(filepath, backup_path)
+                backup_paths.append(backup_path)
+    return backup_paths
+
+
+@contextmanager
+def _locked_all(filepaths: list[str]):
+    if not filepaths:
+        yield
+        return
+    with _locked(filepaths[0]):
+        with _locked_all(filepaths[1:]):
+            yield
+
+
+def reshard(new_shard_count: int):
+    """
+    Redistribute all data across `new_shard_count` shards while the bot keeps running.
+    Writers to the old shards wait for the switch and then retry against the new layout.
+    """
+    if new_shard_count < 1:
+        raise ValueError("Shard count must be at least 1.")
+    _ensure_store()
+    # Held for the whole switch so concurrent reshards (in any process) run one
+    # after the other, each starting from the layout the previous one left
+    with _locked(_db_path(SHARD_MANIFEST_FILE)):
+        old_shard_count = get_shard_count()
+        if new_shard_count == old_shard_count:
+            return
+
+        old_paths = sorted(
+            get_shard_path(base_filename, shard, old_shard_count)
+            for base_filename in (TASKS_DB_FILE, STATES_DB_FILE)
+            for shard in range(old_shard_count)
+        )
+        with _locked_all(old_paths):
+            for base_filename in (TASKS_DB_FILE, STATES_DB_FILE):
+                new_shards = [{} for _ in range(new_shard_count)]
+                for shard in range(old_shard_count):
+                    old_data = _load_json(
+                        get_shard_path(base_filename, shard, old_shard_count)
+                    )
+                    for conversation_id, value in old_data.items():
+                        new_shard = get_shard_index(conversation_id, new_shard_count)
+                        new_shards[new_shard][conversation_id] = value
+                for shard, data in enumerate(new_shards):
+                    _save_json(
+                        get_shard_path(base_filename, shard, new_shard_count), data
+                    )
+                    if base_filename == TASKS_DB_FILE:
+                        _save_shard_stats(shard, new_shard_count, _build_stats(data))
+            _save_json(_db_path(SHARD_MANIFEST_FILE), {"shards": new_shard_count})
+            old_stats_paths = [
+                get_shard_path(base_filename, shard, old_shard_count)
+                for base_filename in (STATS_DB_FILE, TOTALS_DB_FILE)
+                for shard in range(old_shard_count)
+            ]
+            for filepath in old_paths + old_stats_paths:
+                _stats_cache.pop(filepath, None)
+                if os.path.exists(filepath):
+                    os.remove(filepath)
+            # Anyone still waiting on an old lock re-checks the layout once they get it
+            for filepath in old_paths:
+                if os.path.exists(f"{filepath}.lock"):
+                    os.remove(f"{filepath}.lock")
+        logger.info(
+            "Resharded store from %s to %s shards", old_shard_count, new_shard_count
+        )
+
+
+# --- Task Statistics ---
+
+# Per-conversation counters of each tasks shard, keyed by stats file path and
+# validated against the file's (mtime_ns, inode, size) so other processes' writes are seen
+_stats_cache: dict[str, tuple[tuple[int, int, int], dict]] = {}
+
+
+def _empty_stats() -> dict:
+    return {
+        "totals": {"pending": 0, "done": 0, "conversations": 0},
+        "conversations": {},
+    }
+
+
+def _file_key(filepath: str) -> tuple[int, int, int]:
+    file_stat = os.stat(filepath)
+    return file_stat.st_mtime_ns, file_stat.st_ino, file_stat.st_size
+
+
+def _save_shard_stats(shard: int, shard_count: int, stats: dict):
+    """Write a shard's counters; the caller holds the tasks shard lock."""
+    stats_path = get_shard_path(STATS_DB_FILE, shard, shard_count)
+    _save_json(stats_path, stats["conversations"])
+    _save_json(get_shard_path(TOTALS_DB_FILE, shard, shard_count), stats["totals"])
+    _stats_cache[stats_path] = (_file_key(stats_path), stats["conversations"])
+
+
+def _bootstrap_shard_stats(
+    shard: int, shard_count: int, all_tasks_data: dict | None = None
+) -> dict | None:
+    """
+    Build and save a shard's counters from its tasks if they don't exist yet,
+    e.g. for data written before counters were kept. Returns them if built.
+    The caller holds the tasks shard lock.
+    """
+    if os.path.exists(
+        get_shard_path(STATS_DB_FILE, shard, shard_count)
+    ) and os.path.exists(get_shard_path(TOTALS_DB_FILE, shard, shard_count)):
+        return None
+    if all_tasks_data is None:
+        all_tasks_data = _load_json(get_shard_path(TASKS_DB_FILE, shard, shard_count))
+    stats = _build_stats(all_tasks_data)
+    _save_shard_stats(shard, shard_count, stats)
+    return stats
+
+
+def _load_shard_stats(shard: int, shard_count: int, all_tasks_data: dict) -> dict:
+    """Fresh, mutable copy of a shard's counters for a write transaction."""
+    if _bootstrap_shard_stats(shard, shard_count, all_tasks_data) is not None:
+        # The bootstrapped counters are cached for readers, so mutate a separate copy
+        return _build_stats(all_tasks_data)
+    return {
+        "totals": _load_json(get_shard_path(TOTALS_DB_FILE, shard, shard_count)),
+        "conversations": _load_json(get_shard_path(STATS_DB_FILE, shard, shard_count)),
+    }
+
+
+def _read_conversation_counters(shard: int, shard_count: int) -> dict:
+    """Read-only per-conversation counters of a shard, parsed only when the file changed."""
+    _bootstrap_shard_stats(shard, shard_count)
+    stats_path = get_shard_path(STATS_DB_FILE, shard, shard_count)
+    file_key = _file_key(stats_path)
+    cached = _stats_cache.get(stats_path)
+    if cached is None or cached[0] != file_key:
+        cached = _stats_cache[stats_path] = (file_key, _load_json(stats_path))
+    return cached[1]
+
+
+def _read_shard_totals(shard: int, shard_count: int) -> dict:
+    stats = _bootstrap_shard_stats(shard, shard_count)
+    if stats is not None:
+        return stats["totals"]
+    return _load_json(get_shard_path(TOTALS_DB_FILE, shard, shard_count))
+
+
+def _count_tasks(tasks: list) -> tuple[int, int]:
+    done = sum(1 for task in tasks if task.get("done"))
+    return len(tasks) - done, done
+
+
+def _adjust_stats(stats: dict, conversation_id: str, pending: int = 0, done: int = 0):
+    """Apply counter deltas for one conversation and the shard totals."""
+    totals = stats["totals"]
+    counters = stats["conversations"].get(conversation_id)
+    if counters is None:
+        counters = stats["conversations"][conversation_id] = {"pending": 0, "done": 0}
+        totals["conversations"] += 1
+    counters["pending"] += pending
+    counters["done"] += done
+    totals["pending"] += pending
+    totals["done"] += done
+    if not counters["pending"] and not counters["done"]:
+        del stats["conversations"][conversation_id]
+        totals["conversations"] -= 1
+
+
+def _recount_stats(stats: dict, conversation_id: str, old_tasks: list, new_tasks: list):
+    old_pending, old_done = _count_tasks(old_tasks)
+    new_pending, new_done = _count_tasks(new_tasks)
+    _adjust_stats(
+        stats, conversation_id, new_pending - old_pending, new_done - old_done
+    )
+
+
+def _build_stats(all_tasks_data: dict) -> dict:
+    stats = _empty_stats()
+    for conversation_id, tasks in all_tasks_data.items():
+        pending, done = _count_tasks(tasks)
+        _adjust_stats(stats, conversation_id, pending, done)
+    return stats
+
+
+def _stats_summary(pending: int, done: int) -> dict:
+    total = pending + done
+    return {
+        "pending": pending,
+        "done": done,
+        "total": total,
+        "completion_rate": round(done / total, 4) if total else 0.0,
+    }
+
+
+def get_conversation_stats(conversation_id: str) -> dict:
+    """Pending/done counts and completion rate for a conversation, read from its counters."""
+    with _locked_shard(TASKS_DB_FILE, conversation_id):
+        shard_count = get_shard_count()
+        counters = _read_conversation_counters(
+            get_shard_index(conversation_id, shard_count), shard_count
+        ).get(conversation_id, {"pending": 0, "done": 0})
+        return _stats_summary(counters["pending"], counters["done"])
+
+
+def get_global_stats() -> dict:
+    """
+    Store-wide counts, summed from the small per-shard totals files.
+    If the store is resharded part way through, the sum starts over on the new layout.
+    """
+    while True:
+        pending = done = conversations = 0
+        shard_count = get_shard_count()
+        for shard in range(shard_count):
+            with _locked(get_shard_path(TASKS_DB_FILE, shard, shard_count)):
+                if get_shard_count() != shard_count:
+                    break
+                totals = _read_shard_totals(shard, shard_count)
+            pending += totals["pending"]
+            done += totals["done"]
+            conversations += totals["conversations"]
+        else:
+            return {**_stats_summary(pending, done), "conversations": conversations}
+
+
+def verify_stats() -> int:
+    """
+    Rebuild every shard's counters from its tasks.
+    Returns the number of shards whose counters had drifted.
+    """
+    drifted = 0
+    shard_count = get_shard_count()
+    for shard in range(shard_count):
+        tasks_path = get_shard_path(TASKS_DB_FILE, shard, shard_count)
+        with _locked(tasks_path):
+            if get_shard_count() != shard_count:
+                # Resharding rebuilds all counters itself
+                break
+            rebuilt = _build_stats(_load_json(tasks_path))
+            stats_path = get_shard_path(STATS_DB_FILE, shard, shard_count)
+            totals_path = get_shard_path(TOTALS_DB_FILE, shard, shard_count)
+            if not (os.path.exists(stats_path) and os.path.exists(totals_path)):
+                _save_shard_stats(shard, shard_count, rebuilt)
+                continue
+            current = {
+                "totals": _load_json(totals_path),
+                "conversations": _load_json(stats_path),
+            }
+            if current != rebuilt:
+                drifted += 1
+                logger.warning("Rebuilt drifted task counters in %s", stats_path)
+                _save_shard_stats(shard, shard_count, rebuilt)
+    return drifted
 
 
 # --- Task Management ---
@@ -33,58 +493,153 @@ def _save_json(filepath, data):
 
 def get_tasks(conversation_id: str) -> list:
     """Retrieve all tasks for a given conversation_id."""
-    all_tasks_data = _load_json(TASKS_DB_FILE)
-    return all_tasks_data.get(conversation_id, [])
+    with _shard_data(TASKS_DB_FILE, conversation_id, write=False) as all_tasks_data:
+        return all_tasks_data.get(conversation_id, [])
 
 
 def save_tasks(conversation_id: str, tasks_list: list):
     """Save all tasks for a given conversation_id."""
-    all_tasks_data = _load_json(TASKS_DB_FILE)
-    all_tasks_data[conversation_id] = tasks_list
-    _save_json(TASKS_DB_FILE, all_tasks_data)
+    with _tasks_transaction(conversation_id) as (all_tasks_data, stats):
+        old_tasks = all_tasks_data.get(conversation_id, [])
+        all_tasks_data[conversation_id] = tasks_list
+        _recount_stats(stats, conversation_id, old_tasks, tasks_list)
 
 
 def add_task_item(conversation_id: str, description: str):
     """Add a new task for a conversation."""
-    tasks = get_tasks(conversation_id)
-    tasks.append({"description": description, "done": False, "id": len(tasks) + 1})
-    save_tasks(conversation_id, tasks)
-    logger.info(f"Task added for {conversation_id}: {description}")
+    with _tasks_transaction(conversation_id) as (all_tasks_data, stats):
+        tasks = all_tasks_data.setdefault(conversation_id, [])
+        tasks.append({"description": description, "done": False, "id": len(tasks) + 1})
+        _adjust_stats(stats, conversation_id, pending=1)
+    logger.info(
+        "Task added for %s: %s",
+        conversation_id,
+        description,
+        extra={"event": "task_added", "conversation_id": conversation_id},
+    )
 
 
 def delete_task_item(conversation_id: str, task_number: int) -> bool:
     """Delete a task by its 1-based index."""
-    tasks = get_tasks(conversation_id)
-    if 0 < task_number <= len(tasks):
-        deleted_task = tasks.pop(task_number - 1)
-        # Re-assign IDs if necessary or keep them sparse
-        save_tasks(conversation_id, tasks)
+    with _tasks_transaction(conversation_id) as (all_tasks_data, stats):
+        tasks = all_tasks_data.get(conversation_id, [])
+        deleted_task = None
+        if 0 < task_number <= len(tasks):
+            # Re-assign IDs if necessary or keep them sparse
+            deleted_task = tasks.pop(task_number - 1)
+            if deleted_task.get("done"):
+                _adjust_stats(stats, conversation_id, done=-1)
+            else:
+                _adjust_stats(stats, conversation_id, pending=-1)
+    if deleted_task:
         logger.info(
-            f"Task {task_number} deleted for {conversation_id}: {deleted_task['description']}"
+            "Task %s deleted for %s: %s",
+            task_number,
+            conversation_id,
+            deleted_task["description"],
+            extra={"event": "task_deleted", "conversation_id": conversation_id},
         )
         return True
     logger.warning(
-        f"Invalid task number {task_number} for deletion for {conversation_id}"
+        "Invalid task number %s for deletion for %s",
+        task_number,
+        conversation_id,
+        extra={"conversation_id": conversation_id},
     )
     return False
 
 
 def mark_task_item_done(conversation_id: str, task_number: int) -> bool:
     """Mark a task as done by its 1-based index."""
-    tasks = get_tasks(conversation_id)
-    if 0 < task_number <= len(tasks):
-        tasks[task_number - 1]["done"] = True
-        save_tasks(conversation_id, tasks)
+    with _tasks_transaction(conversation_id) as (all_tasks_data, stats):
+        tasks = all_tasks_data.get(conversation_id, [])
+        done_task = None
+        if 0 < task_number <= len(tasks):
+            done_task = tasks[task_number - 1]
+            if not done_task.get("done"):
+                _adjust_stats(stats, conversation_id, pending=-1, done=1)
+            done_task["done"] = True
+    if done_task:
         logger.info(
-            f"Task {task_number} marked done for {conversation_id}: {tasks[task_number - 1]['description']}"
+            "Task %s marked done for %s: %s",
+            task_number,
+            conversation_id,
+            done_task["description"],
+            extra={"event": "task_done", "conversation_id": conversation_id},
         )
         return True
     logger.warning(
-        f"Invalid task number {task_number} for marking done for {conversation_id}"
+        "Invalid task number %s for marking done for %s",
+        task_number,
+        conversation_id,
+        extra={"conversation_id": conversation_id},
     )
     return False
 
 
+def iter_all_tasks():
+    """
+    Yield (conversation_id, tasks) for every conversation, one shard at a time.
+    Only a single shard is held in memory, and its lock is released before yielding.
+    """
+    shard_count = get_shard_count()
+    for shard in range(shard_count):
+        filepath = get_shard_path(TASKS_DB_FILE, shard, shard_count)
+        with _locked(filepath):
+            shard_data = _load_json(filepath)
+        yield from shard_data.items()
+        del shard_data
+
+
+def _import_task(task: dict, position: int) -> dict:
+    return {
+        "description": task["description"],
+        "done": bool(task.get("done", False)),
+        "id": task.get("id", position),
+    }
+
+
+def bulk_import_tasks(records: list[dict], replaced_conversations: set) -> int:
+    """
+    Apply a batch of export records with one load/save per touched shard.
+    The first record seen for a conversation replaces its task list, so
+    importing the same export twice gives the same result. Conversations are
+    added to `replaced_conversations`, which the caller keeps across batches
+    so later task records append. Returns the number of records applied.
+    """
+    pending = records
+    while pending:
+        with _tasks_transaction(pending[0]["conversation_id"]) as (
+            all_tasks_data,
+            stats,
+        ):
+            # The layout cannot change while this shard's lock is held
+            shard_count = get_shard_count()
+            shard = get_shard_index(pending[0]["conversation_id"], shard_count)
+            remaining = []
+            for record in pending:
+                conversation_id = record["conversation_id"]
+                if get_shard_index(conversation_id, shard_count) != shard:
+                    remaining.append(record)
+                    continue
+                if conversation_id in replaced_conversations:
+                    removed_tasks = []
+                    tasks = all_tasks_data.setdefault(conversation_id, [])
+                else:
+                    removed_tasks = all_tasks_data.get(conversation_id, [])
+                    tasks = all_tasks_data[conversation_id] = []
+                    replaced_conversations.add(conversation_id)
+                imported_tasks = record["tasks"] if "tasks" in record else [record]
+                added_tasks = [
+                    _import_task(task, len(tasks) + position)
+                    for position, task in enumerate(imported_tasks, start=1)
+                ]
+                tasks.extend(added_tasks)
+                _recount_stats(stats, conversation_id, removed_tasks, added_tasks)
+        pending = remaining
+    return len(records)
+
+
 def get_tasks_string(conversation_id: str) -> str:
     """Get a formatted string of tasks for a conversation."""
     tasks = get_tasks(conversation_id)
@@ -103,25 +658,35 @@ def get_tasks_string(conversation_id: str) -> str:
 
 def get_conversation_state(conversation_id: str) -> dict | None:
     """Retrieve the state for a given conversation_id."""
-    states_data = _load_json(STATES_DB_FILE)
-    return states_data.get(conversation_id)
+    with _shard_data(STATES_DB_FILE, conversation_id, write=False) as states_data:
+        return states_data.get(conversation_id)
 
 
 def set_conversation_state(
     conversation_id: str, state_name: str | None, data: dict = None
 ):
     """Set the state for a given conversation_id. If state_name is None, clears the state."""
-    states_data = _load_json(STATES_DB_FILE)
-    if state_name is None:
-        if conversation_id in states_data:
-            del states_data[conversation_id]
-            logger.info(f"State cleared for conversation {conversation_id}")
-    else:
-        states_data[conversation_id] = {"name": state_name, "data": data or {}}
-        logger.info(
-            f"State set for conversation {conversation_id}: {state_name} with data {data}"
-        )
-    _save_json(STATES_DB_FILE, states_data)
+    with _shard_data(STATES_DB_FILE, conversation_id) as states_data:
+        if state_name is None:
+            if conversation_id in states_data:
+                del states_data[conversation_id]
+                logger.debug(
+                    "State cleared for conversation %s",
+                    conversation_id,
+                    extra={
+                        "event": "state_cleared",
+                        "conversation_id": conversation_id,
+                    },
+                )
+        else:
+            states_data[conversation_id] = {"name": state_name, "data": data or {}}
+            logger.debug(
+                "State set for conversation %s: %s with data %s",
+                conversation_id,
+                state_name,
+                data,
+                extra={"event": "state_set", "conversation_id": conversation_id},
+            )
 
 
 def clear_conversation_state(conversation_id: str):
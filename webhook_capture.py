@@ -0,0 +1,160 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+import time
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Captures buffered on the writer thread before they hit the disk
+CAPTURE_BUFFER_RECORDS = 100
+# Longest time a capture waits in the buffer on a quiet bot
+CAPTURE_FLUSH_SECONDS = 1.0
+
+_STOP = object()
+
+
+class CaptureWriter:
+    """
+    Writes queued webhook captures as NDJSON lines from a background thread.
+    Lines are buffered and flushed every CAPTURE_BUFFER_RECORDS records or
+    CAPTURE_FLUSH_SECONDS seconds, and the file is rotated like
+    logging.handlers.RotatingFileHandler (capture.ndjson.1 is the newest backup).
+    """
+
+    def __init__(self, filepath: str, max_bytes: int, backup_count: int):
+        self.filepath = filepath
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(
+            target=self._run, name="webhook-capture", daemon=True
+        )
+        self._file = None
+
+    def start(self):
+        self._file = open(self.filepath, "a", encoding="utf-8")
+        self._thread.start()
+
+    def put(self, arrived_at: float, payload: dict):
+        self._queue.put((arrived_at, payload))
+
+    def stop(self):
+        """Write out buffered captures and stop the writer thread."""
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def _rotate(self):
+        self._file.close()
+        try:
+            for index in range(self.backup_count - 1, 0, -1):
+                source = f"{self.filepath}.{index}"
+                if os.path.exists(source):
+                    os.replace(source, f"{self.filepath}.{index + 1}")
+            if self.backup_count > 0:
+                os.replace(self.filepath, f"{self.filepath}.1")
+            else:
+                os.remove(self.filepath)
+        finally:
+            # A failed rotation keeps appending to the current file
+            self._file = open(self.filepath, "a", encoding="utf-8")
+
+    def _flush(self, lines: list[str]):
+        if self._file.closed:
+            # Reopening failed after an earlier rotation; try again
+            self._file = open(self.filepath, "a", encoding="utf-8")
+        for line in lines:
+            if self.max_bytes and self._file.tell() + len(line) > self.max_bytes:
+                if self._file.tell():
+                    try:
+                        self._rotate()
+                    except OSError:
+                        logger.exception("Error rotating webhook capture file")
+            self._file.write(line)
+        self._file.flush()
+
+    def _run(self):
+        buffer = []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            if item is not None and item is not _STOP:
+                arrived_at, payload = item
+                buffer.append(
+                    json.dumps(
+                        {"ts": arrived_at, "payload": payload}, ensure_ascii=False
+                    )
+                    + "\n"
+                )
+                if deadline is None:
+                    deadline = time.monotonic() + CAPTURE_FLUSH_SECONDS
+            if buffer and (
+                item is None or item is _STOP or len(buffer) >= CAPTURE_BUFFER_RECORDS
+            ):
+                try:
+                    self._flush(buffer)
+                except Exception:
+                    # Losing a batch of captures must not stop the writer,
+                    # or the queue would grow with every webhook
+                    logger.exception("Error writing webhook capture")
+                buffer = []
+                deadline = None
+            if item is _STOP:
+                self._file.close()
+                return
+
+
+_writer: CaptureWriter | None = None
+
+
+def setup_capture() -> bool:
+    """
+    Start writing captured webhooks to Config.WEBHOOK_CAPTURE_FILE, if set.
+    Returns whether capturing is enabled.
+    """
+    global _writer
+    if _writer is not None:
+        return True
+    if not Config.WEBHOOK_CAPTURE_FILE:
+        return False
+
+    _writer = CaptureWriter(
+        Config.WEBHOOK_CAPTURE_FILE,
+        Config.WEBHOOK_CAPTURE_MAX_BYTES,
+        Config.WEBHOOK_CAPTURE_BACKUPS,
+    )
+    _writer.start()
+    atexit.register(shutdown_capture)
+    return True
+
+
+def capture_webhook(payload: dict):
+    """Queue a webhook payload for capture; its arrival time is taken now."""
+    if _writer is not None:
+        _writer.put(time.time(), payload)
+
+
+def shutdown_capture():
+    """Write out buffered captures and stop the writer thread."""
+    global _writer
+    if _writer is not None:
+        _writer.stop()
+        _writer = None
+
+
+def iter_captures(filepaths: list[str]):
+    """Yield (arrival timestamp, payload) from capture files, oldest file first."""
+    for filepath in filepaths:
+        with open(filepath, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    captured = json.loads(line)
+                    yield captured["ts"], captured["payload"]